@@ -2,134 +2,140 @@
 ================================================
 Plot the track map and color each section by the driver who was fastest there.
 """
+import os
+import matplotlib
 import matplotlib.pyplot as plt
 import fastf1.plotting
 import pandas as pd
 import numpy as np
 from matplotlib.collections import LineCollection
 from matplotlib.colors import ListedColormap, BoundaryNorm
+import matplotlib.colors as mcolors
 import matplotlib.patches as patches
+from scipy.spatial import cKDTree
+from f1_insights.utils import (
+    enable_fastf1_cache,
+    get_fastest_laps_telemetry,
+    load_or_build,
+    session_cache_path
+)
 
 # Enable FastF1's dark color scheme
 fastf1.plotting.setup_mpl(misc_mpl_mods=False, color_scheme='fastf1')
 
-# Load a session and its telemetry data
-session = fastf1.get_session(2025, 'Australia', 'Q')
-session.load()
-
-# Get the list of all drivers who participated in the session
-all_drivers = session.results['Abbreviation'].tolist()
-print(f"Found {len(all_drivers)} drivers in the session")
-
-# Get the circuit info for the track map
-circuit_info = session.get_circuit_info()
-if circuit_info is None:
-    print("Circuit info not available. Using fastest lap for track visualization.")
-    # We can also construct a track map from the fastest lap's telemetry
-    fastest_lap = session.laps.pick_fastest()
-    fastest_tel = fastest_lap.get_telemetry()
-    track_x, track_y = fastest_tel['X'].values, fastest_tel['Y'].values
-else:
-    print("Using circuit info for track visualization.")
-    track_x, track_y = circuit_info.X, circuit_info.Y
+# Cache FastF1's raw API responses between runs
+enable_fastf1_cache()
 
-# Function to calculate the distance between two points
-def distance(x1, y1, x2, y2):
-    return np.sqrt((x2 - x1)**2 + (y2 - y1)**2)
+# Get the session; its data is only loaded if the pickled data is missing or stale.
+# Bump SESSION_CACHE_VERSION whenever the layout of the pickled data changes.
+SESSION_CACHE_VERSION = 2
+session = fastf1.get_session(2025, 'Australia', 'Q')
+# Load the session and extract everything the plots need
+def build_session_data():
+    session.load()
+    
+    # Get the list of all drivers who participated in the session
+    all_drivers = session.results['Abbreviation'].tolist()
+    
+    # Get the circuit info for the track map
+    circuit_info = session.get_circuit_info()
+    if circuit_info is None or not hasattr(circuit_info, 'X'):
+        print("Circuit outline not available. Using fastest lap for track visualization.")
+        # We can also construct a track map from the fastest lap's telemetry
+        fastest_lap = session.laps.pick_fastest()
+        fastest_tel = fastest_lap.get_telemetry()
+        track_x, track_y = fastest_tel['X'].values, fastest_tel['Y'].values
+    else:
+        print("Using circuit info for track visualization.")
+        track_x, track_y = circuit_info.X, circuit_info.Y
+    
+    return {
+        # Each driver's fastest-lap position and speed telemetry
+        'tel_by_driver': get_fastest_laps_telemetry(session, all_drivers, with_position=True),
+        'laps_meta': {
+            'drivers': all_drivers,
+            # Look up every driver's color once for the whole session
+            'driver_colors': fastf1.plotting.get_driver_color_mapping(session=session),
+            'track_xy': (track_x, track_y),
+        },
+        'circuit_info': circuit_info,
+    }
+
+session_data = load_or_build(session_cache_path(session, '_positions'), build_session_data, key=(session.api_path, SESSION_CACHE_VERSION))
+tel_by_driver = session_data['tel_by_driver']
+laps_meta = session_data['laps_meta']
+circuit_info = session_data['circuit_info']
+track_x, track_y = laps_meta['track_xy']
+print(f"Found {len(laps_meta['drivers'])} drivers in the session")
+
+# Shared style for the corner number labels on both track maps
+CORNER_LABEL_STYLE = dict(fontsize=9, ha='center', va='center', color='white',
+                          bbox=dict(facecolor='black', alpha=0.7))
+
+# Label every corner of the circuit at its position on the track map
+def add_corner_numbers(ax, circuit_info):
+    if circuit_info is None or not hasattr(circuit_info, 'corners') or circuit_info.corners.empty:
+        return
+    corners = circuit_info.corners
+    for x, y, label in zip(corners['X'].to_numpy(), corners['Y'].to_numpy(),
+                           corners['Number'].astype(str)):
+        ax.text(x, y, label, **CORNER_LABEL_STYLE)
 
 # Divide the track into segments (we'll use 50-100 segments for a good visualization)
 num_segments = 80
 
-# Create arrays to store the segments and their points
-segments = []
-segment_points = []
+# Cumulative distance along the track using the x, y coordinates
+track_x, track_y = np.asarray(track_x, dtype=float), np.asarray(track_y, dtype=float)
+step_length = np.hypot(np.diff(track_x), np.diff(track_y))
+cum_length = np.concatenate(([0.0], np.cumsum(step_length)))
 
-# Calculate the total track length using the x, y coordinates
-track_length = 0
-for i in range(1, len(track_x)):
-    track_length += distance(track_x[i-1], track_y[i-1], track_x[i], track_y[i])
+# Split the track at equal arc-length intervals (consecutive segments share
+# their boundary point)
+boundaries = np.unique(np.searchsorted(cum_length, np.linspace(0, cum_length[-1], num_segments + 1)))
+segments = [np.column_stack((track_x[start:stop + 1], track_y[start:stop + 1]))
+            for start, stop in zip(boundaries[:-1], boundaries[1:])]
 
-# Target length of each segment
-segment_target_length = track_length / num_segments
-
-# Create the segments
-current_segment = []
-current_length = 0
-
-for i in range(1, len(track_x)):
-    pt1 = (track_x[i-1], track_y[i-1])
-    pt2 = (track_x[i], track_y[i])
-    
-    segment_length = distance(pt1[0], pt1[1], pt2[0], pt2[1])
-    
-    if current_segment == []:
-        current_segment.append(pt1)
-    
-    current_segment.append(pt2)
-    current_length += segment_length
-    
-    if current_length >= segment_target_length or i == len(track_x) - 1:
-        # Store the segment
-        if len(current_segment) >= 2:
-            segments.append(current_segment)
-            # Store the midpoint of this segment
-            mid_idx = len(current_segment) // 2
-            segment_points.append(current_segment[mid_idx])
-        # Start a new segment but keep the last point as the first point
-        current_segment = [pt2]
-        current_length = 0
+# Midpoint of each segment, interpolated along the arc length
+mid_length = 0.5 * (cum_length[boundaries[:-1]] + cum_length[boundaries[1:]])
+segment_points = np.column_stack((np.interp(mid_length, cum_length, track_x),
+                                  np.interp(mid_length, cum_length, track_y)))
 
 print(f"Divided track into {len(segments)} segments")
 
-# Prepare to collect fastest driver in each segment
-segment_fastest_driver = [None] * len(segments)
-segment_fastest_speed = [0] * len(segments)
+# Prepare a (drivers x segments) matrix of speeds; segments without data stay at -inf
+drivers_arr = np.array(list(tel_by_driver), dtype=object)
+speed_matrix = np.full((len(drivers_arr), len(segments)), -np.inf)
 driver_colors = {}
 
 # For each driver, analyze their fastest lap
-for driver in all_drivers:
+for i, (driver, tel) in enumerate(tel_by_driver.items()):
     try:
-        # Get the fastest lap for the current driver
-        driver_lap = session.laps.pick_drivers(driver).pick_fastest()
+        # Get the color for this driver
+        driver_colors[driver] = laps_meta['driver_colors'].get(driver, 'gray')
         
-        if driver_lap.empty:
-            print(f"No valid lap found for {driver}")
-            continue
-            
-        # Get telemetry data with x, y coordinates
-        driver_tel = driver_lap.get_telemetry()
+        # Find the closest telemetry point to every segment midpoint at once
+        tree = cKDTree(np.c_[tel.x, tel.y])
+        _, closest_idx = tree.query(segment_points)
         
-        if driver_tel.empty:
-            print(f"No telemetry data for {driver}")
-            continue
-        
-        # Get the team color for this driver
-        try:
-            driver_colors[driver] = fastf1.plotting.driver_color(driver)
-        except:
-            driver_colors[driver] = 'gray'
-        
-        # For each segment of the track, find the speed of this driver
-        for i, segment in enumerate(segments):
-            # Get midpoint of this segment
-            mid_x, mid_y = segment_points[i]
-            
-            # Find the closest point in the telemetry data
-            distances = np.sqrt((driver_tel['X'] - mid_x)**2 + (driver_tel['Y'] - mid_y)**2)
-            closest_idx = np.argmin(distances)
-            
-            # Get the speed at this point
-            speed = driver_tel['Speed'].iloc[closest_idx]
-            
-            # Update if this driver is fastest in this segment
-            if speed > segment_fastest_speed[i]:
-                segment_fastest_driver[i] = driver
-                segment_fastest_speed[i] = speed
+        # Get the speed at these points
+        speed_matrix[i] = tel.speed[closest_idx]
         
         print(f"Processed data for {driver}")
     except Exception as e:
         print(f"Error processing data for {driver}: {e}")
 
+# Find the fastest driver in each segment (None and a speed of 0 where no
+# driver has data)
+if len(drivers_arr) == 0:
+    no_data = np.ones(len(segments), dtype=bool)
+    segment_fastest_driver = np.full(len(segments), None, dtype=object)
+    segment_fastest_speed = np.zeros(len(segments))
+else:
+    segment_fastest_speed = speed_matrix.max(axis=0)
+    no_data = np.isneginf(segment_fastest_speed)
+    segment_fastest_driver = np.where(no_data, None, drivers_arr[speed_matrix.argmax(axis=0)])
+    segment_fastest_speed[no_data] = 0
+
 # Create the plot
 plt.figure(figsize=(16, 9))
 ax = plt.gca()
@@ -175,33 +181,24 @@ except Exception as e:
 
 # Add corner numbers if available
 try:
-    if circuit_info is not None and 'Corners' in circuit_info:
-        corners = circuit_info['Corners']
-        for corner in corners:
-            ax.text(corner['X'], corner['Y'], str(corner['Number']),
-                   fontsize=9, ha='center', va='center', color='white',
-                   bbox=dict(facecolor='black', alpha=0.7))
+    add_corner_numbers(ax, circuit_info)
 except Exception as e:
     print(f"Could not add corner numbers: {e}")
 
-# Create a legend with drivers and their colors
-handles = []
-labels = []
+# Create a legend with drivers and their colors, counting how many segments
+# each driver was fastest in (drivers who were never fastest are left out)
+fastest_drivers, segment_counts = np.unique(segment_fastest_driver[~no_data].astype(str), return_counts=True)
 
-for driver in sorted(driver_colors.keys()):
-    if driver in segment_fastest_driver:  # Only show drivers who were fastest somewhere
-        count = segment_fastest_driver.count(driver)
-        percent = count / len(segment_fastest_driver) * 100
-        
-        patch = patches.Patch(color=driver_colors[driver], label=f"{driver} ({count} segments, {percent:.1f}%)")
-        handles.append(patch)
-        labels.append(f"{driver} ({count} segments, {percent:.1f}%)")
+# Sort legend by number of fastest segments (descending)
+order = np.argsort(-segment_counts, kind='stable')
 
-# Sort legend by number of fastest segments
-counts = [segment_fastest_driver.count(driver) for driver in sorted(driver_colors.keys()) if driver in segment_fastest_driver]
-sorted_idx = np.argsort(counts)[::-1]  # Descending order
-handles = [handles[i] for i in sorted_idx]
-labels = [labels[i] for i in sorted_idx]
+handles = []
+labels = []
+for driver, count in zip(fastest_drivers[order], segment_counts[order]):
+    percent = count / len(segment_fastest_driver) * 100
+    label = f"{driver} ({count} segments, {percent:.1f}%)"
+    handles.append(patches.Patch(color=driver_colors[driver], label=label))
+    labels.append(label)
 
 # Add the legend to the plot
 ax.legend(handles, labels, loc='upper right', fontsize=10)
@@ -239,21 +236,18 @@ try:
     ax2 = plt.gca()
     
     # Create a LineCollection for the track segments but color by speed
-    colors_speed = []
-    max_speed = max(segment_fastest_speed)
-    min_speed = min(filter(lambda x: x > 0, segment_fastest_speed))
+    valid = segment_fastest_speed > 0
+    max_speed = segment_fastest_speed[valid].max()
+    min_speed = segment_fastest_speed[valid].min()
     
     # Create a colormap from blue (slow) to red (fast)
-    cmap = plt.cm.get_cmap('coolwarm')
+    cmap = matplotlib.colormaps['coolwarm']
     
-    for i, segment in enumerate(segments):
-        speed = segment_fastest_speed[i]
-        if speed > 0:
-            # Normalize speed to [0, 1] range for the colormap
-            normalized_speed = (speed - min_speed) / (max_speed - min_speed)
-            colors_speed.append(cmap(normalized_speed))
-        else:
-            colors_speed.append('gray')
+    # Normalize speeds to the [0, 1] range and map them to colors in one call;
+    # segments without data are drawn in gray
+    normalized_speed = np.where(valid, (segment_fastest_speed - min_speed) / (max_speed - min_speed), 0.0)
+    colors_speed = cmap(normalized_speed)
+    colors_speed[~valid] = mcolors.to_rgba('gray')
     
     # Create the LineCollection
     track_collection_speed = LineCollection(track_segments, colors=colors_speed, linewidths=5)
@@ -261,12 +255,7 @@ try:
     
     # Add corner numbers if available
     try:
-        if circuit_info is not None and 'Corners' in circuit_info:
-            corners = circuit_info['Corners']
-            for corner in corners:
-                ax2.text(corner['X'], corner['Y'], str(corner['Number']),
-                       fontsize=9, ha='center', va='center', color='white',
-                       bbox=dict(facecolor='black', alpha=0.7))
+        add_corner_numbers(ax2, circuit_info)
     except Exception as e:
         print(f"Could not add corner numbers to speed map: {e}")
     
@@ -307,29 +296,22 @@ try:
 except Exception as e:
     print(f"Error creating speed heatmap: {e}")
 
-# Optional: Export the segment data to CSV
+# Optional: Export the segment data to Parquet
 try:
-    import os
-    
     # Create output directory
     output_dir = 'f1_data_export'
     os.makedirs(output_dir, exist_ok=True)
     
-    # Create a DataFrame with segment information
-    segment_data = []
-    
-    for i, segment in enumerate(segments):
-        mid_x, mid_y = segment_points[i]
-        segment_data.append({
-            'SegmentID': i,
-            'MidpointX': mid_x,
-            'MidpointY': mid_y,
-            'FastestDriver': segment_fastest_driver[i],
-            'FastestSpeed': segment_fastest_speed[i]
-        })
-    
-    segment_df = pd.DataFrame(segment_data)
-    segment_df.to_csv(os.path.join(output_dir, f'Track_Segments_{session.event["EventName"]}_{session.event.year}.csv'), index=False)
-    print(f"Exported segment data to CSV")
+    # Create a DataFrame with segment information, built column by column
+    segment_df = pd.DataFrame({
+        'SegmentID': np.arange(len(segments)),
+        'MidpointX': segment_points[:, 0],
+        'MidpointY': segment_points[:, 1],
+        'FastestDriver': segment_fastest_driver,
+        'FastestSpeed': segment_fastest_speed
+    })
+    segment_df.to_parquet(os.path.join(output_dir, f'Track_Segments_{session.event["EventName"]}_{session.event.year}.parquet'),
+                          engine='pyarrow', compression='zstd', index=False)
+    print(f"Exported segment data to Parquet")
 except Exception as e:
-    print(f"Error exporting segment data: {e}")
\ No newline at end of file
+    print(f"Error exporting segment data: {e}")
@@ -4,63 +4,115 @@ Compare all drivers' fastest qualifying laps by overlaying their speed traces.
 """
 import matplotlib.pyplot as plt
 import fastf1.plotting
-import pandas as pd
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 import numpy as np
+from scipy.ndimage import uniform_filter1d
+from f1_insights.utils import (
+    enable_fastf1_cache,
+    get_fastest_laps_telemetry,
+    load_or_build,
+    session_cache_path
+)
 
 # Enable Matplotlib patches for plotting timedelta values and load
 # FastF1's dark color scheme
 fastf1.plotting.setup_mpl(mpl_timedelta_support=True, misc_mpl_mods=False,
                           color_scheme='fastf1')
 
-# Load a session and its telemetry data
+# Let matplotlib thin out the dense speed traces while drawing
+plt.rcParams['path.simplify'] = True
+plt.rcParams['path.simplify_threshold'] = 1.0
+
+# Cache FastF1's raw API responses between runs
+enable_fastf1_cache()
+
+# Get the session; its data is only loaded if the pickled data is missing or stale.
+# Bump SESSION_CACHE_VERSION whenever the layout of the pickled data changes.
+SESSION_CACHE_VERSION = 2
 session = fastf1.get_session(2025, 'Australia', 'Q')
-session.load()
+# Map the sector boundaries of the overall fastest lap to distances
+def get_sector_distances(session):
+    try:
+        lap_info = session.laps.pick_fastest()
+        sector1 = lap_info['Sector1SessionTime'] - lap_info['LapStartTime']
+        sector2 = lap_info['Sector2SessionTime'] - lap_info['LapStartTime']
+        
+        # Map these time deltas to distance
+        fastest_lap_tel = lap_info.get_car_data().add_distance()
+        time_sec = fastest_lap_tel['Time'].dt.total_seconds().to_numpy()
+        lap_distance = fastest_lap_tel['Distance'].to_numpy()
+        sector_idx = np.searchsorted(time_sec, [sector1.total_seconds(), sector2.total_seconds()])
+        s1_distance, s2_distance = lap_distance[np.clip(sector_idx, 0, len(lap_distance) - 1)]
+        return s1_distance, s2_distance, lap_distance.max()
+    except Exception as e:
+        print(f"Could not compute sector distances: {e}")
+        return None
+
+# Load the session and extract everything the plots need
+def build_session_data():
+    session.load()
+    
+    # Get the list of all drivers who participated in the session
+    all_drivers = session.results['Abbreviation'].tolist()
+    
+    # Look up each team's color once instead of per driver
+    team_by_driver = dict(zip(session.results['Abbreviation'], session.results['TeamName']))
+    team_colors = {team: fastf1.plotting.get_team_color(team, session=session)
+                   for team in set(team_by_driver.values())}
+    
+    return {
+        # Each driver's fastest-lap telemetry, shared by both figures
+        'tel_by_driver': get_fastest_laps_telemetry(session, all_drivers),
+        'laps_meta': {
+            'drivers': all_drivers,
+            'team_by_driver': team_by_driver,
+            'team_colors': team_colors,
+            'sector_distances': get_sector_distances(session),
+        },
+        'circuit_info': session.get_circuit_info(),
+    }
 
-# Get the list of all drivers who participated in the session
-all_drivers = session.results['Abbreviation'].tolist()
-print(f"Found {len(all_drivers)} drivers in the session")
+session_data = load_or_build(session_cache_path(session), build_session_data, key=(session.api_path, SESSION_CACHE_VERSION))
+tel_by_driver = session_data['tel_by_driver']
+laps_meta = session_data['laps_meta']
+circuit_info = session_data['circuit_info']
+team_by_driver = laps_meta['team_by_driver']
+team_colors = laps_meta['team_colors']
+print(f"Found {len(laps_meta['drivers'])} drivers in the session")
 
 # Create figure and axis objects
 fig, ax = plt.subplots(figsize=(14, 8))
 
 # Function to smooth the speed data to reduce noise and make the plot clearer
 def smooth_data(data, window_size=5):
-    return pd.Series(data).rolling(window=window_size, center=True).mean().fillna(method='bfill').fillna(method='ffill').values
+    return uniform_filter1d(np.asarray(data, dtype=np.float32), size=window_size, mode='nearest')
 
-# Plot speed traces for each driver with a slight transparency
-for driver in all_drivers:
+# Collect the speed traces for each driver so they can be drawn in one batch
+trace_segments = []
+trace_colors = []
+legend_handles = []
+for driver, tel in tel_by_driver.items():
     try:
-        # Get the fastest lap for the current driver
-        driver_lap = session.laps.pick_drivers(driver).pick_fastest()
-        
-        if driver_lap.empty:
-            print(f"No valid lap found for {driver}")
-            continue
-            
-        # Get telemetry data and add distance
-        driver_tel = driver_lap.get_car_data().add_distance()
-        
-        if driver_tel.empty:
-            print(f"No telemetry data for {driver}")
-            continue
-            
-        # Get the team color
-        try:
-            team_color = fastf1.plotting.get_team_color(driver_lap['Team'], session=session)
-        except:
-            # Fallback if team color is not available
-            team_color = 'gray'
+        # Get the team color, falling back to gray if it is not available
+        team_color = team_colors.get(team_by_driver.get(driver, tel.team), 'gray')
         
         # Smooth the speed data
-        smoothed_speed = smooth_data(driver_tel['Speed'])
+        smoothed_speed = smooth_data(tel.speed)
         
-        # Plot the speed trace
-        ax.plot(driver_tel['Distance'], smoothed_speed, color=team_color, label=driver, alpha=0.8, linewidth=1.5)
+        # Queue the speed trace, with a proxy artist to keep the legend entry
+        trace_segments.append(np.column_stack((tel.distance, smoothed_speed)))
+        trace_colors.append(team_color)
+        legend_handles.append(Line2D([], [], color=team_color, label=driver, alpha=0.8, linewidth=1.5))
         
         print(f"Plotted data for {driver}")
     except Exception as e:
         print(f"Error plotting data for {driver}: {e}")
 
+# Draw all speed traces with a slight transparency as a single collection
+ax.add_collection(LineCollection(trace_segments, colors=trace_colors, linewidths=1.5, alpha=0.8, rasterized=True))
+ax.autoscale()
+
 # Set axis labels
 ax.set_xlabel('Distance (m)', fontsize=12)
 ax.set_ylabel('Speed (km/h)', fontsize=12)
@@ -71,18 +123,11 @@ ax.grid(True, alpha=0.3, linestyle='--')
 # Add legend outside the plot for better visibility
 box = ax.get_position()
 ax.set_position([box.x0, box.y0, box.width * 0.85, box.height])
-ax.legend(loc='center left', bbox_to_anchor=(1, 0.5), fontsize=10)
+ax.legend(handles=legend_handles, loc='center left', bbox_to_anchor=(1, 0.5), fontsize=10)
 
 # Add track sectors as vertical lines
-try:
-    lap_info = session.laps.pick_fastest()
-    sector1 = lap_info['Sector1SessionTime'] - lap_info['LapStartTime']
-    sector2 = lap_info['Sector2SessionTime'] - lap_info['LapStartTime']
-    
-    # Map these time deltas to distance
-    fastest_lap_tel = lap_info.get_car_data().add_distance()
-    s1_distance = fastest_lap_tel['Distance'].iloc[np.argmin(np.abs(fastest_lap_tel['Time'] - sector1))]
-    s2_distance = fastest_lap_tel['Distance'].iloc[np.argmin(np.abs(fastest_lap_tel['Time'] - sector2))]
+if laps_meta['sector_distances'] is not None:
+    s1_distance, s2_distance, lap_end = laps_meta['sector_distances']
     
     # Plot sector lines
     ax.axvline(x=s1_distance, color='white', linestyle='--', alpha=0.8, label='Sector 1/2')
@@ -92,9 +137,7 @@ try:
     y_pos = ax.get_ylim()[1] * 0.95
     ax.text(s1_distance/2, y_pos, "Sector 1", ha='center', va='top', color='white', bbox=dict(facecolor='black', alpha=0.5))
     ax.text(s1_distance + (s2_distance-s1_distance)/2, y_pos, "Sector 2", ha='center', va='top', color='white', bbox=dict(facecolor='black', alpha=0.5))
-    ax.text(s2_distance + (fastest_lap_tel['Distance'].max()-s2_distance)/2, y_pos, "Sector 3", ha='center', va='top', color='white', bbox=dict(facecolor='black', alpha=0.5))
-except Exception as e:
-    print(f"Could not add sector lines: {e}")
+    ax.text(s2_distance + (lap_end-s2_distance)/2, y_pos, "Sector 3", ha='center', va='top', color='white', bbox=dict(facecolor='black', alpha=0.5))
 
 # Add title
 plt.suptitle(f"All Drivers' Fastest Lap Speed Comparison\n"
@@ -117,46 +160,32 @@ try:
     # Create a new figure
     fig2, ax2 = plt.subplots(figsize=(14, 8))
     
-    # Initialize lists to store all speed values at each distance point
-    all_speeds = {}
-    
     # Distance sampling resolution (in meters)
     resolution = 10
     
-    # Collect speed data from all drivers
-    for driver in all_drivers:
+    # Size the bins from the longest lap, then preallocate one row per driver.
+    # Shorter laps keep NaN in their trailing bins.
+    max_distance = max(tel.distance.max() for tel in tel_by_driver.values())
+    n_bins = int(max_distance / resolution) + 1
+    bin_centers = np.arange(n_bins) * resolution
+    speeds_matrix = np.full((len(tel_by_driver), n_bins), np.nan, dtype=np.float32)
+    
+    # Resample each driver's speed trace onto the shared distance bins
+    for i, (driver, tel) in enumerate(tel_by_driver.items()):
         try:
-            # Get the fastest lap for the current driver
-            driver_lap = session.laps.pick_drivers(driver).pick_fastest()
-            
-            if driver_lap.empty:
-                continue
-                
-            # Get telemetry data and add distance
-            driver_tel = driver_lap.get_car_data().add_distance()
-            
-            if driver_tel.empty:
-                continue
-                
-            # Sample speeds at regular distance intervals
-            for d in range(0, int(driver_tel['Distance'].max()), resolution):
-                # Find the closest point in the data
-                idx = np.argmin(np.abs(driver_tel['Distance'] - d))
-                distance = int(driver_tel['Distance'].iloc[idx] / resolution) * resolution
-                
-                if distance not in all_speeds:
-                    all_speeds[distance] = []
-                
-                all_speeds[distance].append(driver_tel['Speed'].iloc[idx])
-                
+            # Locate the sample at each bin with a single binary search
+            n_driver_bins = np.searchsorted(bin_centers, tel.distance.max(), side='right')
+            idx = np.searchsorted(tel.distance, bin_centers[:n_driver_bins])
+            idx = np.clip(idx, 0, len(tel.distance) - 1)
+            speeds_matrix[i, :n_driver_bins] = tel.speed[idx]
         except Exception as e:
             print(f"Error processing data for {driver} in min/max plot: {e}")
     
-    # Convert to arrays for plotting
-    distances = sorted(all_speeds.keys())
-    min_speeds = [min(all_speeds[d]) if all_speeds[d] else 0 for d in distances]
-    max_speeds = [max(all_speeds[d]) if all_speeds[d] else 0 for d in distances]
-    median_speeds = [np.median(all_speeds[d]) if all_speeds[d] else 0 for d in distances]
+    # Reduce over the drivers axis
+    distances = bin_centers
+    min_speeds = np.nanmin(speeds_matrix, axis=0)
+    max_speeds = np.nanmax(speeds_matrix, axis=0)
+    median_speeds = np.nanmedian(speeds_matrix, axis=0)
     
     # Smooth the arrays
     min_speeds = smooth_data(min_speeds, window_size=5)
@@ -164,7 +193,7 @@ try:
     median_speeds = smooth_data(median_speeds, window_size=5)
     
     # Plot the envelope
-    ax2.fill_between(distances, min_speeds, max_speeds, alpha=0.3, color='lightblue', label='Speed Range')
+    ax2.fill_between(distances, min_speeds, max_speeds, alpha=0.3, color='lightblue', label='Speed Range', rasterized=True)
     ax2.plot(distances, median_speeds, color='blue', linewidth=2, label='Median Speed')
     
     # Set axis labels
@@ -176,33 +205,16 @@ try:
     
     # Try to add corner numbers
     try:
-        circuit_info = session.get_circuit_info()
-        if circuit_info is not None and 'Corners' in circuit_info:
-            corners = circuit_info['Corners']
-            
-            # Create a mapping from distance to corner number
-            corner_mapping = {}
-            
-            # This is a simplification - ideally we'd have exact corner distances
-            # but we'll approximate based on the speed profile
-            # Find local minima in the median speed profile which likely indicate corners
-            speed_diffs = np.diff(median_speeds)
-            potential_corners = []
-            
-            for i in range(1, len(speed_diffs) - 1):
-                if speed_diffs[i-1] < 0 and speed_diffs[i] > 0:
-                    # Local minimum
-                    potential_corners.append((distances[i], median_speeds[i]))
+        if circuit_info is not None and hasattr(circuit_info, 'corners') and not circuit_info.corners.empty:
+            corners = circuit_info.corners
             
-            # If we have as many potential corners as actual corners, map them
-            if len(potential_corners) >= len(corners):
-                for i, corner in enumerate(corners):
-                    if i < len(potential_corners):
-                        corner_dist = potential_corners[i][0]
-                        corner_speed = potential_corners[i][1]
-                        ax2.text(corner_dist, corner_speed - 20, str(corner['Number']), 
-                               fontsize=9, ha='center', va='top', 
-                               bbox=dict(facecolor='white', alpha=0.7, boxstyle='round'))
+            # Label each corner at its distance along the lap, just below the
+            # median speed there, like the annotate_corners plots
+            corner_speeds = np.interp(corners['Distance'], distances, median_speeds)
+            for corner, corner_speed in zip(corners.itertuples(), corner_speeds):
+                ax2.text(corner.Distance, corner_speed - 20, f"{corner.Number}{corner.Letter}", 
+                       fontsize=9, ha='center', va='top', 
+                       bbox=dict(facecolor='white', alpha=0.7, boxstyle='round'))
     except Exception as e:
         print(f"Could not add corner annotations: {e}")
     
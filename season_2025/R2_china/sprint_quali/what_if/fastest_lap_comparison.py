@@ -10,7 +10,6 @@ import fastf1
 import fastf1.plotting
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy.interpolate import interp1d
 
 # Enable Matplotlib patches for plotting timedelta values and load
 # FastF1's dark color scheme
@@ -29,6 +28,10 @@ drivers = {
     'PIA': {'lap': session.laps.pick_driver('PIA').iloc[-2], 'label': 'Piastri', 'team': 'MCL'}
 }
 
+# Look up each team's color once
+team_colors = {info['team']: fastf1.plotting.get_team_color(info['team'], session=session)
+               for info in drivers.values()}
+
 # Print lap numbers for verification
 print(f"\nLap Numbers:")
 for driver_code, driver_info in drivers.items():
@@ -39,41 +42,40 @@ telemetry_data = {}
 for driver_code, driver_info in drivers.items():
     tel = driver_info['lap'].get_telemetry()
     tel['Time'] = tel['Time'] - tel['Time'].iloc[0]  # Normalize time to start from 0
-    telemetry_data[driver_code] = tel
+    # Keep distance and time (as float seconds) as plain arrays for interpolation
+    telemetry_data[driver_code] = (tel['Distance'].to_numpy(),
+                                   tel['Time'].dt.total_seconds().to_numpy())
 
 # Create the plot
 fig, ax = plt.subplots(figsize=(15, 6))
 
 # Interpolate the data to have the same number of points
-max_distance = max(telemetry['Distance'].max() for telemetry in telemetry_data.values())
+max_distance = max(distance.max() for distance, _ in telemetry_data.values())
 distance_points = np.linspace(0, max_distance, 1000)
 
-# Get Hamilton's reference time progression
-ham_interp = interp1d(telemetry_data['HAM']['Distance'], 
-                     telemetry_data['HAM']['Time'],
-                     bounds_error=False, fill_value='extrapolate')
-ham_times = ham_interp(distance_points)
+# Get Hamilton's reference time progression (np.interp holds the edge values
+# for points beyond the end of a lap)
+ham_distance, ham_time = telemetry_data['HAM']
+ham_times = np.interp(distance_points, ham_distance, ham_time)
 
 # Calculate and plot delta times for each driver
 for driver_code, driver_info in drivers.items():
     if driver_code != 'HAM':
-        # Create interpolation function for current driver
-        driver_interp = interp1d(telemetry_data[driver_code]['Distance'],
-                                telemetry_data[driver_code]['Time'],
-                                bounds_error=False, fill_value='extrapolate')
-        driver_times = driver_interp(distance_points)
+        # Interpolate the current driver's time at the same distance points
+        driver_distance, driver_time = telemetry_data[driver_code]
+        driver_times = np.interp(distance_points, driver_distance, driver_time)
         
         # Calculate delta times (positive means slower than Hamilton)
         delta_times = driver_times - ham_times
         
         # Plot delta times with custom color for Norris
-        color = driver_info.get('color', fastf1.plotting.get_team_color(driver_info['team'], session=session))
+        color = driver_info.get('color', team_colors[driver_info['team']])
         ax.plot(distance_points, delta_times,
                 color=color,
                 label=driver_info['label'], linewidth=2)
 
 # Add zero reference line for Hamilton
-ax.axhline(y=0, color=fastf1.plotting.get_team_color('FER', session=session),
+ax.axhline(y=0, color=team_colors[drivers['HAM']['team']],
            linestyle='-', label='Hamilton', linewidth=2)
 
 # Add circuit corners
@@ -12,7 +12,11 @@ setup(
         "pandas",
         "numpy",
         "matplotlib",
+        "pyarrow",
     ],
+    extras_require={
+        "numba": ["numba"],
+    },
     author="Your Name",
     author_email="your.email@example.com",
     description="Utilities for F1 data analysis",
@@ -1,82 +1,119 @@
 #!/usr/bin/env python3
 """Script to analyze slipstream effects in F1 races."""
 
-import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
 import fastf1
+from fastf1.core import CircuitInfo
+import numpy as np
+from f1_insights.utils.cache_utils import (
+    enable_fastf1_cache,
+    load_or_build,
+    session_cache_path
+)
 from f1_insights.utils.telemetry_utils import (
+    TelemetryChannels,
+    analyze_slipstream_batch,
+    get_corner_distance_map,
     get_driver_lap_telemetry,
-    get_straight_section_telemetry,
-    analyze_slipstream
+    to_telemetry_channels
 )
 
-def print_available_corners(session: fastf1.core.Session) -> None:
+# Bump SESSION_CACHE_VERSION whenever the layout of the pickled data changes.
+SESSION_CACHE_VERSION = 1
+
+def build_session_data(session: fastf1.core.Session, drivers: List[str]) -> Dict[str, Any]:
+    """Load the session and extract everything the slipstream analysis needs.
+    
+    Args:
+        session: FastF1 session object, not yet loaded
+        drivers: Driver codes (e.g., ['VER', 'HAM'])
+        
+    Returns:
+        Dict with the CircuitInfo under 'circuit' and, under 'telemetry', a
+        dict mapping each driver to the TelemetryChannels of their fastest
+        lap (None if no telemetry was found)
+    """
+    session.load()
+    
+    # Get each driver's fastest lap telemetry. Loading dominates the run
+    # time and is independent per driver, so it runs on a thread pool.
+    with ThreadPoolExecutor(max_workers=max(1, len(drivers))) as executor:
+        telemetry = executor.map(lambda driver: get_driver_lap_telemetry(session, driver), drivers)
+        telemetry_by_driver = {
+            driver: None if driver_telemetry.empty else to_telemetry_channels(driver_telemetry)
+            for driver, driver_telemetry in zip(drivers, telemetry)
+        }
+    
+    return {
+        'circuit': session.get_circuit_info(),
+        'telemetry': telemetry_by_driver
+    }
+
+def print_available_corners(circuit: CircuitInfo) -> None:
     """Print available corner names for the circuit.
     
     Args:
-        session: FastF1 session object
+        circuit: CircuitInfo object containing circuit data
     """
-    circuit = session.get_circuit_info()
-    print("\nAvailable corners:")
-    for _, row in circuit.corners.iterrows():
-        print(f"- {row['Number']} (Distance: {row['Distance']:.0f}m)")
+    corners = circuit.corners
+    lines = [
+        f"- {number} (Distance: {distance:.0f}m)"
+        for number, distance in zip(corners['Number'].tolist(), corners['Distance'].tolist())
+    ]
+    print("\nAvailable corners:\n" + "\n".join(lines))
 
 def analyze_slipstream_for_driver(
-    session: fastf1.core.Session,
     driver: str,
-    start_corner: str,
-    end_corner: str
+    telemetry: TelemetryChannels,
+    sections: List[Tuple[str, str]],
+    corner_distances: Dict[str, float],
+    min_distance: float = 50.0,
+    min_speed: float = 300.0
 ) -> None:
     """Analyze slipstream effects for a specific driver.
     
+    All sections are analyzed in one analyze_slipstream_batch call.
+    
     Args:
-        session: FastF1 session object
         driver: Driver code (e.g., 'VER')
-        start_corner: Name of the starting corner
-        end_corner: Name of the ending corner
+        telemetry: Telemetry of the driver's fastest lap
+        sections: (start_corner, end_corner) pairs
+        corner_distances: Corner distance map from get_corner_distance_map
+        min_distance: Minimum distance to consider for slipstream (meters)
+        min_speed: Minimum speed to consider for slipstream (km/h)
     """
-    # Get driver's fastest lap telemetry
-    telemetry = get_driver_lap_telemetry(session, driver)
-    
-    if telemetry.empty:
-        print(f"No telemetry data found for {driver}")
-        return
-    
-    # Get section telemetry
-    section = get_straight_section_telemetry(
-        telemetry,
-        start_corner,
-        end_corner,
-        session.get_circuit_info()
+    edges = np.array([
+        (corner_distances[start_corner], corner_distances[end_corner])
+        for start_corner, end_corner in sections
+    ], dtype=float).ravel()
+    has_slipstream, min_dists, max_speeds = analyze_slipstream_batch(
+        telemetry.distance, telemetry.dist_ahead, telemetry.speed, edges,
+        min_distance, min_speed
     )
     
-    if section.empty:
-        print(f"No telemetry data found for {driver} between {start_corner} and {end_corner}")
-        return
-    
-    # Analyze slipstream
-    has_slipstream, min_dist, max_speed = analyze_slipstream(section)
-    
-    # Print results
-    print(f"\nDriver: {driver}")
-    print(f"Section: {start_corner} to {end_corner}")
-    print(f"Minimum distance to car ahead: {min_dist:.1f}m")
-    print(f"Maximum speed: {max_speed:.1f} km/h")
-    print(f"Slipstream detected: {'Yes' if has_slipstream else 'No'}")
+    for section_index, (start_corner, end_corner) in enumerate(sections):
+        min_dist = min_dists[section_index]
+        max_speed = max_speeds[section_index]
+        if np.isnan(min_dist) and np.isnan(max_speed):
+            print(f"No telemetry data found for {driver} between {start_corner} and {end_corner}")
+            continue
+        
+        # Print results
+        print(f"\nDriver: {driver}")
+        print(f"Section: {start_corner} to {end_corner}")
+        print(f"Minimum distance to car ahead: {min_dist:.1f}m")
+        print(f"Maximum speed: {max_speed:.1f} km/h")
+        print(f"Slipstream detected: {'Yes' if has_slipstream[section_index] else 'No'}")
 
 def main():
     """Main function to analyze slipstream effects."""
     try:
         # Enable caching
-        cache_dir = os.path.abspath(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 'cache'))
-        os.makedirs(cache_dir, exist_ok=True)
-        fastf1.Cache.enable_cache(cache_dir)
+        enable_fastf1_cache()
         
-        # Load session data
+        # Get session data
         session = fastf1.get_session(2024, 'Chinese GP', 'SQ')
-        session.load()
-        
-        # Print available corners
-        print_available_corners(session)
         
         # Define drivers to analyze
         drivers = ['VER', 'HAM', 'PER', 'LEC', 'SAI', 'NOR']
@@ -88,11 +125,37 @@ def main():
             ('Turn 13', 'Turn 14')  # Final complex
         ]
         
+        # Reuse the circuit info and telemetry pickled by a previous run, so
+        # repeated runs skip session.load() and the telemetry extraction
+        session_data = load_or_build(
+            session_cache_path(session, '_slipstream'),
+            lambda: build_session_data(session, drivers),
+            key=(session.api_path, SESSION_CACHE_VERSION, tuple(drivers))
+        )
+        circuit = session_data['circuit']
+        telemetry_by_driver = session_data['telemetry']
+        
+        # Print available corners
+        print_available_corners(circuit)
+        
+        # Look up the corner distances once and drop sections whose corners
+        # are not on this circuit
+        corner_distances = get_corner_distance_map(circuit)
+        valid_sections = []
+        for start_corner, end_corner in sections:
+            if start_corner in corner_distances and end_corner in corner_distances:
+                valid_sections.append((start_corner, end_corner))
+            else:
+                print(f"Warning: Could not find corners {start_corner} or {end_corner}")
+        
         # Analyze each driver
         for driver in drivers:
             print(f"\nAnalyzing {driver}...")
-            for start_corner, end_corner in sections:
-                analyze_slipstream_for_driver(session, driver, start_corner, end_corner)
+            telemetry = telemetry_by_driver[driver]
+            if telemetry is None:
+                print(f"No telemetry data found for {driver}")
+                continue
+            analyze_slipstream_for_driver(driver, telemetry, valid_sections, corner_distances)
     
     except Exception as e:
         print(f"Error during analysis: {str(e)}")
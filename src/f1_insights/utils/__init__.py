@@ -1,15 +1,37 @@
 """F1 analysis utilities package."""
 
+from f1_insights.utils.cache_utils import (
+    enable_fastf1_cache,
+    load_or_build,
+    session_cache_path
+)
 from f1_insights.utils.driver_utils import get_driver_info
 from f1_insights.utils.telemetry_utils import (
+    TelemetryArrays,
+    TelemetryChannels,
+    to_telemetry_channels,
+    get_corner_distance_map,
     get_straight_section_telemetry,
+    get_straight_section_arrays,
     analyze_slipstream,
-    get_driver_lap_telemetry
+    analyze_slipstream_batch,
+    get_driver_lap_telemetry,
+    get_fastest_laps_telemetry
 )
 
 __all__ = [
     'get_driver_info',
+    'get_corner_distance_map',
     'get_straight_section_telemetry',
+    'get_straight_section_arrays',
     'analyze_slipstream',
-    'get_driver_lap_telemetry'
+    'analyze_slipstream_batch',
+    'get_driver_lap_telemetry',
+    'get_fastest_laps_telemetry',
+    'enable_fastf1_cache',
+    'load_or_build',
+    'session_cache_path',
+    'TelemetryArrays',
+    'TelemetryChannels',
+    'to_telemetry_channels'
 ] 
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""Utilities for caching derived session data."""
+
+import os
+import pickle
+import threading
+import weakref
+from typing import Any, Callable, Hashable, Optional
+import fastf1
+
+# Shared cache location at the repository root, used by every script
+# regardless of the working directory it is run from
+CACHE_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', '..', '..', 'cache')
+)
+
+def enable_fastf1_cache() -> str:
+    """Enable FastF1's API response cache in the shared cache directory.
+
+    Returns:
+        Path of the cache directory
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fastf1.Cache.enable_cache(CACHE_DIR)
+    return CACHE_DIR
+
+def session_cache_path(session: fastf1.core.Session, suffix: str = '') -> str:
+    """Build the path of the pickle holding a script's derived session data.
+
+    Args:
+        session: FastF1 session the data is derived from
+        suffix: Optional suffix telling apart scripts that pickle different
+                data for the same session (e.g. '_positions')
+
+    Returns:
+        Path inside the shared cache directory, e.g.
+        <root>/cache/session_cache/2025_Australian_Grand_Prix_Qualifying.pkl
+    """
+    file_name = f"{session.event.year}_{session.event['EventName']}_{session.name}{suffix}.pkl"
+    return os.path.join(CACHE_DIR, 'session_cache', file_name.replace(' ', '_'))
+
+class IdentityCache:
+    """In-memory cache of values derived from objects such as DataFrames.
+
+    Entries are keyed by id() and hold only a weak reference to their object,
+    so the cache never keeps a table (or the session it belongs to) alive. A
+    reused id() is detected by checking the weak reference. Cached values
+    must not reference the object themselves. Safe to share between threads.
+
+    Example:
+        >>> _positions = IdentityCache(maxsize=4)
+        >>> positions = _positions.get_or_build(session.results, build_positions)
+    """
+
+    def __init__(self, maxsize: int = 4):
+        self.maxsize = maxsize
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_or_build(self, obj: Any, build_fn: Callable[[Any], Any]) -> Any:
+        """Return the value cached for obj, building it with build_fn(obj) on a miss."""
+        with self._lock:
+            entry = self._entries.get(id(obj))
+            if entry is not None and entry[0]() is obj:
+                return entry[1]
+
+            value = build_fn(obj)
+            self._entries.pop(id(obj), None)
+            while len(self._entries) >= self.maxsize:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[id(obj)] = (weakref.ref(obj), value)
+            return value
+
+def load_or_build(
+    cache_path: str,
+    build_fn: Callable[[], Any],
+    key: Optional[Hashable] = None
+) -> Any:
+    """Load a value pickled by a previous run, or build it and pickle it.
+
+    Args:
+        cache_path: Path of the pickle file
+        build_fn: Function called without arguments to build the value when
+                  no usable cache exists
+        key: Optional value identifying the source data (e.g. a session's
+             api_path). A cache written with a different key is rebuilt.
+
+    Returns:
+        The cached or freshly built value
+
+    Example:
+        >>> session = fastf1.get_session(2025, 'Australia', 'Q')
+        >>> data = load_or_build(session_cache_path(session),
+        ...                      lambda: build_session_data(session),
+        ...                      key=session.api_path)
+    """
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_key, value = pickle.load(f)
+            if cached_key == key:
+                return value
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable cache {cache_path}: {e}")
+
+    value = build_fn()
+
+    cache_dir = os.path.dirname(cache_path)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # Write to a temporary file first so a failed dump never leaves a
+    # truncated cache behind
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return value
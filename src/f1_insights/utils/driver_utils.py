@@ -1,8 +1,19 @@
 import fastf1
 import pandas as pd
+from f1_insights.utils.cache_utils import IdentityCache
 
 """Utilities for handling F1 driver information."""
 
+# Row position of each driver abbreviation, built once per results table
+_results_positions = IdentityCache(maxsize=4)
+
+def _abbreviation_positions(results):
+    """Map each driver abbreviation to the position of its first results row."""
+    positions = {}
+    for position, abbreviation in enumerate(results['Abbreviation'].tolist()):
+        positions.setdefault(abbreviation, position)
+    return positions
+
 def get_driver_info(session, driver_code):
     """Get driver's full information from their three-letter code.
     
@@ -27,13 +38,14 @@ def get_driver_info(session, driver_code):
         'team': 'Unknown'
     }
     
-    driver_data = session.results.loc[session.results['Abbreviation'] == driver_code]
-    if driver_data.empty:
+    positions = _results_positions.get_or_build(session.results, _abbreviation_positions)
+    if driver_code not in positions:
         return default_info
+    driver_data = session.results.iloc[positions[driver_code]]
     
     return {
-        'name': f"{driver_data['FirstName'].iloc[0]} {driver_data['LastName'].iloc[0]}",
-        'number': driver_data['DriverNumber'].iloc[0],
-        'team': driver_data['TeamName'].iloc[0]
+        'name': f"{driver_data['FirstName']} {driver_data['LastName']}",
+        'number': driver_data['DriverNumber'],
+        'team': driver_data['TeamName']
     }
 
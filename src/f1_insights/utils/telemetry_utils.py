@@ -1,59 +1,219 @@
 """Telemetry analysis utilities for F1 data."""
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Mapping, NamedTuple, Sequence, Tuple, Optional, Union
 from fastf1.core import CircuitInfo
 import fastf1
+from f1_insights.utils.cache_utils import IdentityCache
+
+try:
+    from f1_insights.utils.telemetry_utils_numba import slipstream_detect, slipstream_scan
+except ImportError:
+    slipstream_detect = None
+    slipstream_scan = None
+
+# Row positions of each driver's laps, built once per laps table. Only the
+# positions are cached: a groupby object would keep the laps table, and with
+# it the whole loaded session, alive.
+_laps_positions = IdentityCache(maxsize=4)
+
+def _driver_lap_positions(laps: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Map each driver to the row positions of their laps."""
+    return laps.groupby('Driver').indices
+
+@dataclass
+class TelemetryArrays:
+    """Channels of a driver's fastest lap stored as plain float32 numpy arrays.
+
+    float32 is plenty for plotting and analysis (a lap's distance and time
+    are far below the range where float32 loses meter/millisecond precision)
+    and halves the memory moved through downstream reductions.
+
+    Attributes:
+        distance: Distance driven since the start of the lap (meters)
+        speed: Speed (km/h)
+        time_s: Time since the start of the lap (seconds)
+        x: X position, or None if position data was not requested
+        y: Y position, or None if position data was not requested
+        team: Team name
+        lap_time_s: Lap time (seconds)
+    """
+    __slots__ = ('distance', 'speed', 'time_s', 'x', 'y', 'team', 'lap_time_s')
+
+    distance: np.ndarray
+    speed: np.ndarray
+    time_s: np.ndarray
+    x: Optional[np.ndarray]
+    y: Optional[np.ndarray]
+    team: str
+    lap_time_s: float
+
+class TelemetryChannels(NamedTuple):
+    """The telemetry channels used by the slipstream analysis, as plain arrays.
+
+    Being a tuple of ndarrays, it can be sliced cheaply and passed straight
+    into numba-compiled kernels.
+
+    Attributes:
+        distance: Distance driven since the start of the lap (meters)
+        speed: Speed (km/h)
+        dist_ahead: Distance to the car ahead (meters)
+    """
+    distance: np.ndarray
+    speed: np.ndarray
+    dist_ahead: np.ndarray
+
+def to_telemetry_channels(telemetry: pd.DataFrame) -> TelemetryChannels:
+    """Extract the slipstream channels of a telemetry DataFrame.
+    
+    Args:
+        telemetry: DataFrame with Distance, Speed and DistanceToCarAhead columns
+        
+    Returns:
+        TelemetryChannels holding zero-copy views of the columns
+    """
+    return TelemetryChannels(
+        distance=telemetry['Distance'].to_numpy(copy=False),
+        speed=telemetry['Speed'].to_numpy(copy=False),
+        dist_ahead=telemetry['DistanceToCarAhead'].to_numpy(copy=False)
+    )
+
+def get_corner_distance_map(circuit: CircuitInfo) -> Dict[str, float]:
+    """Map each corner of a circuit to its distance from the start line.
+    
+    Build this once per session and pass it to get_straight_section_telemetry
+    to avoid filtering the corners DataFrame for every section.
+    
+    Args:
+        circuit: CircuitInfo object containing circuit data
+        
+    Returns:
+        Dict mapping corner name to distance (meters). If a corner name
+        appears more than once, the first occurrence is kept.
+    """
+    corners = circuit.corners
+    distance_map = {}
+    for number, distance in zip(corners['Number'].tolist(), corners['Distance'].tolist()):
+        distance_map.setdefault(number, distance)
+    return distance_map
+
+def _section_bounds(
+    distance: np.ndarray,
+    start_corner: str,
+    end_corner: str,
+    circuit: Union[CircuitInfo, Dict[str, float]]
+) -> Optional[Tuple[int, int]]:
+    """Find the start and stop row positions of a section, or None if a corner is unknown."""
+    # Get corner distances
+    if isinstance(circuit, dict):
+        corner_distances = circuit
+    else:
+        corner_distances = get_corner_distance_map(circuit)
+    start_distance = corner_distances.get(start_corner)
+    end_distance = corner_distances.get(end_corner)
+    
+    if start_distance is None or end_distance is None:
+        print(f"Warning: Could not find corners {start_corner} or {end_corner}")
+        return None
+    
+    # Distance increases monotonically along a lap, so the section is a
+    # contiguous slice that can be located by binary search
+    start = int(np.searchsorted(distance, start_distance, side='left'))
+    stop = int(np.searchsorted(distance, end_distance, side='right'))
+    return start, stop
 
 def get_straight_section_telemetry(
-    telemetry: pd.DataFrame,
+    telemetry: Union[pd.DataFrame, TelemetryChannels],
     start_corner: str,
     end_corner: str,
-    circuit: CircuitInfo
-) -> pd.DataFrame:
+    circuit: Union[CircuitInfo, Dict[str, float]]
+) -> Union[pd.DataFrame, TelemetryChannels]:
     """Extract telemetry data for a specific section of the circuit.
     
     Args:
-        telemetry: DataFrame containing telemetry data
+        telemetry: DataFrame containing telemetry data, or TelemetryChannels
         start_corner: Name of the starting corner
         end_corner: Name of the ending corner
-        circuit: CircuitInfo object containing circuit data
+        circuit: CircuitInfo object containing circuit data, or a corner
+                 distance map from get_corner_distance_map
         
     Returns:
-        DataFrame containing telemetry data for the specified section
+        - For TelemetryChannels input: TelemetryChannels of the section
+        - Otherwise: DataFrame containing telemetry data for the section
+        Sections with an unknown corner are empty.
     """
-    # Get corner distances
-    corners = circuit.corners
-    start_corner_data = corners[corners['Number'] == start_corner]
-    end_corner_data = corners[corners['Number'] == end_corner]
+    if isinstance(telemetry, TelemetryChannels):
+        bounds = _section_bounds(telemetry.distance, start_corner, end_corner, circuit)
+        start, stop = bounds if bounds is not None else (0, 0)
+        return TelemetryChannels(*(channel[start:stop] for channel in telemetry))
     
-    if start_corner_data.empty or end_corner_data.empty:
-        print(f"Warning: Could not find corners {start_corner} or {end_corner}")
+    bounds = _section_bounds(
+        telemetry['Distance'].to_numpy(copy=False), start_corner, end_corner, circuit
+    )
+    if bounds is None:
         return pd.DataFrame()  # Return empty DataFrame if corners not found
     
-    start_distance = start_corner_data['Distance'].iloc[0]
-    end_distance = end_corner_data['Distance'].iloc[0]
+    start, stop = bounds
+    return telemetry.iloc[start:stop]
+
+def get_straight_section_arrays(
+    telemetry: pd.DataFrame,
+    start_corner: str,
+    end_corner: str,
+    circuit: Union[CircuitInfo, Dict[str, float]],
+    columns: Sequence[str]
+) -> Tuple[int, int, Dict[str, np.ndarray]]:
+    """Extract a section of the circuit as plain arrays.
     
-    # Extract section between corners
-    section = telemetry[
-        (telemetry['Distance'] >= start_distance) &
-        (telemetry['Distance'] <= end_distance)
-    ]
+    Args:
+        telemetry: DataFrame containing telemetry data
+        start_corner: Name of the starting corner
+        end_corner: Name of the ending corner
+        circuit: CircuitInfo object containing circuit data, or a corner
+                 distance map from get_corner_distance_map
+        columns: Column names to extract
+        
+    Returns:
+        Tuple of the section's start and stop row positions and a dict of
+        zero-copy column views. Sections with an unknown corner are empty
+        but keep the columns' dtypes.
+    """
+    if isinstance(telemetry, TelemetryChannels):
+        raise TypeError(
+            "get_straight_section_arrays expects a DataFrame; use "
+            "get_straight_section_telemetry for TelemetryChannels"
+        )
     
-    return section
+    bounds = _section_bounds(
+        telemetry['Distance'].to_numpy(copy=False), start_corner, end_corner, circuit
+    )
+    start, stop = bounds if bounds is not None else (0, 0)
+    return start, stop, {
+        column: telemetry[column].to_numpy(copy=False)[start:stop]
+        for column in columns
+    }
 
 def analyze_slipstream(
-    telemetry: pd.DataFrame,
+    telemetry: Union[pd.DataFrame, Mapping[str, np.ndarray], TelemetryChannels],
     min_distance: float = 50.0,
-    min_speed: float = 300.0
+    min_speed: float = 300.0,
+    detect_only: bool = False
 ) -> Tuple[bool, float, float]:
     """Analyze telemetry data for slipstream effects.
     
     Args:
-        telemetry: DataFrame containing telemetry data
+        telemetry: DataFrame containing telemetry data, or a dict of column
+                   arrays as returned by get_straight_section_arrays
+                   with columns ['DistanceToCarAhead', 'Speed'], or
+                   TelemetryChannels
         min_distance: Minimum distance to consider for slipstream (meters)
         min_speed: Minimum speed to consider for slipstream (km/h)
+        detect_only: If True, only detect slipstream and stop reading the
+                     telemetry as soon as the result is known. The minimum
+                     distance and maximum speed are then returned as NaN.
         
     Returns:
         Tuple containing:
@@ -61,17 +221,99 @@ def analyze_slipstream(
         - Minimum distance to car ahead
         - Maximum speed in the section
     """
-    # Get minimum distance to car ahead
-    min_dist = telemetry['DistanceToCarAhead'].min()
+    if isinstance(telemetry, TelemetryChannels):
+        dist, speed = telemetry.dist_ahead, telemetry.speed
+    else:
+        # np.asarray is a zero-copy view for both Series and ndarray columns
+        dist = np.asarray(telemetry['DistanceToCarAhead'])
+        speed = np.asarray(telemetry['Speed'])
+    
+    # An empty section has nothing to reduce (fmin/fmax have no identity)
+    if dist.size == 0 or speed.size == 0:
+        return False, np.nan, np.nan
     
-    # Get maximum speed
-    max_speed = telemetry['Speed'].max()
+    if detect_only:
+        if slipstream_detect is not None:
+            has_slipstream = slipstream_detect(dist, speed, min_distance, min_speed)
+        else:
+            has_slipstream = bool((dist < min_distance).any() and (speed > min_speed).any())
+        return has_slipstream, np.nan, np.nan
+    
+    # Reduce the raw arrays directly instead of going through pandas. fmin/fmax
+    # skip NaN samples (e.g. no car ahead) just like Series.min()/max() do.
+    # NumPy already vectorises these reductions; splitting the array into
+    # manual accumulator lanes (reshape(-1, 8)) measured several times slower.
+    min_dist = np.fmin.reduce(dist)
+    max_speed = np.fmax.reduce(speed)
     
     # Check for slipstream conditions
     has_slipstream = (min_dist < min_distance) and (max_speed > min_speed)
     
     return has_slipstream, min_dist, max_speed
 
+def analyze_slipstream_batch(
+    distance: np.ndarray,
+    dist_ahead: np.ndarray,
+    speed: np.ndarray,
+    edges: np.ndarray,
+    min_distance: float = 50.0,
+    min_speed: float = 300.0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Analyze several sections of a lap for slipstream effects at once.
+    
+    Uses the numba kernel from telemetry_utils_numba when numba is
+    installed, otherwise one np.fmin.reduceat/np.fmax.reduceat pass per
+    channel over all sections.
+    
+    Args:
+        distance: Distance driven since the start of the lap (meters),
+                  monotonically increasing
+        dist_ahead: Distance to the car ahead (meters)
+        speed: Speed (km/h)
+        edges: Flat array of (start, end) distance pairs, one per section.
+               Both ends are inclusive.
+        min_distance: Minimum distance to consider for slipstream (meters)
+        min_speed: Minimum speed to consider for slipstream (km/h)
+        
+    Raises:
+        ValueError: If edges is not a flat array of (start, end) pairs
+        
+    Returns:
+        Tuple of per-section arrays:
+        - Boolean array indicating if slipstream was detected
+        - Minimum distance to car ahead (NaN if the section has no data)
+        - Maximum speed in the section (NaN if the section has no data)
+    """
+    edges = np.asarray(edges, dtype=float)
+    if edges.ndim != 1 or edges.size % 2:
+        raise ValueError(
+            f"edges must be a flat array of (start, end) pairs, got shape {edges.shape}"
+        )
+    if slipstream_scan is not None:
+        return slipstream_scan(distance, dist_ahead, speed, edges, min_distance, min_speed)
+    
+    starts = np.searchsorted(distance, edges[0::2], side='left')
+    stops = np.searchsorted(distance, edges[1::2], side='right')
+    min_dist = np.full(len(starts), np.nan)
+    max_speed = np.full(len(starts), np.nan)
+    
+    # reduceat reduces between consecutive indices, so interleaving the
+    # section bounds puts each section's result at an even position. Its
+    # indices must lie inside the array, so sections running to the end of
+    # the lap are reduced separately.
+    non_empty = stops > starts
+    inner = non_empty & (stops < len(distance))
+    if inner.any():
+        bounds = np.column_stack([starts[inner], stops[inner]]).ravel()
+        min_dist[inner] = np.fmin.reduceat(dist_ahead, bounds)[::2]
+        max_speed[inner] = np.fmax.reduceat(speed, bounds)[::2]
+    for k in np.flatnonzero(non_empty & ~inner):
+        min_dist[k] = np.fmin.reduce(dist_ahead[starts[k]:])
+        max_speed[k] = np.fmax.reduce(speed[starts[k]:])
+    
+    has_slipstream = (min_dist < min_distance) & (max_speed > min_speed)
+    return has_slipstream, min_dist, max_speed
+
 def get_driver_lap_telemetry(
     session: fastf1.core.Session,
     driver: str,
@@ -85,14 +327,15 @@ def get_driver_lap_telemetry(
         lap_number: Optional lap number. If None, uses fastest lap.
         
     Returns:
-        DataFrame containing telemetry data
+        DataFrame containing telemetry data, with the Distance, Speed and
+        DistanceToCarAhead channels stored as float32
     """
     # Get driver's laps
-    driver_laps = session.laps[session.laps['Driver'] == driver]
-    
-    if driver_laps.empty:
+    positions = _laps_positions.get_or_build(session.laps, _driver_lap_positions)
+    if driver not in positions:
         print(f"No laps found for driver {driver}")
         return pd.DataFrame()
+    driver_laps = session.laps.iloc[positions[driver]]
     
     # Get the specified lap or fastest lap
     if lap_number is not None:
@@ -104,5 +347,77 @@ def get_driver_lap_telemetry(
         print(f"No lap found for driver {driver}")
         return pd.DataFrame()
     
-    # Get telemetry data
-    return lap.get_telemetry() 
\ No newline at end of file
+    # Get telemetry data. Distance, speed and gap fit comfortably in float32,
+    # which halves the memory read by the section reductions.
+    telemetry = lap.get_telemetry()
+    for column in ('Distance', 'Speed', 'DistanceToCarAhead'):
+        if column in telemetry.columns:
+            telemetry[column] = telemetry[column].astype(np.float32, copy=False)
+    
+    return telemetry
+
+def get_fastest_laps_telemetry(
+    session: fastf1.core.Session,
+    drivers: Optional[List[str]] = None,
+    with_position: bool = False,
+    max_workers: int = 8
+) -> Dict[str, TelemetryArrays]:
+    """Get telemetry arrays for each driver's fastest lap.
+
+    Drivers are processed in parallel on a thread pool. Drivers without a
+    valid lap or telemetry are reported and left out of the result.
+
+    Args:
+        session: Loaded FastF1 session object
+        drivers: Driver codes (e.g., ['VER', 'HAM']). If None, uses all
+                 drivers in the session results.
+        with_position: If True, use the merged telemetry including X/Y
+                       position data instead of car data only
+        max_workers: Number of threads used to extract the telemetry
+
+    Returns:
+        Dict mapping driver code to TelemetryArrays, in the order of drivers
+    """
+    if drivers is None:
+        drivers = session.results['Abbreviation'].tolist()
+
+    def extract(driver: str) -> Optional[TelemetryArrays]:
+        try:
+            lap = session.laps.pick_drivers(driver).pick_fastest()
+            if lap is None or lap.empty:
+                print(f"No valid lap found for {driver}")
+                return None
+
+            if with_position:
+                telemetry = lap.get_telemetry()
+            else:
+                telemetry = lap.get_car_data().add_distance()
+
+            if telemetry.empty:
+                print(f"No telemetry data for {driver}")
+                return None
+
+            def channel(values: pd.Series) -> np.ndarray:
+                return values.to_numpy().astype(np.float32, copy=False)
+
+            return TelemetryArrays(
+                distance=channel(telemetry['Distance']),
+                speed=channel(telemetry['Speed']),
+                time_s=channel(telemetry['Time'].dt.total_seconds()),
+                x=channel(telemetry['X']) if with_position else None,
+                y=channel(telemetry['Y']) if with_position else None,
+                team=lap['Team'],
+                lap_time_s=lap['LapTime'].total_seconds()
+            )
+        except Exception as e:
+            print(f"Error loading telemetry for {driver}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(extract, drivers)
+
+    return {
+        driver: arrays
+        for driver, arrays in zip(drivers, results)
+        if arrays is not None
+    }
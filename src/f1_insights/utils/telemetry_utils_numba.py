@@ -0,0 +1,97 @@
+"""Numba-compiled telemetry kernels.
+
+This module requires numba, which is an optional dependency
+(``pip install f1_insights[numba]``). Import it inside a ``try`` block and
+fall back to the pandas/NumPy implementations when it is missing.
+"""
+
+from typing import Tuple
+import numpy as np
+from numba import njit
+
+@njit(cache=True)
+def slipstream_scan(
+    distance: np.ndarray,
+    dist_ahead: np.ndarray,
+    speed: np.ndarray,
+    edges: np.ndarray,
+    min_distance: float = 50.0,
+    min_speed: float = 300.0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Analyze several sections of a lap for slipstream effects in one call.
+
+    Each section is located by binary search on the monotonic distance
+    channel and its minimum gap and maximum speed are found in a single
+    loop. NaN samples are skipped, like pandas' min()/max().
+
+    Args:
+        distance: Distance driven since the start of the lap (meters)
+        dist_ahead: Distance to the car ahead (meters)
+        speed: Speed (km/h)
+        edges: Flat array of (start, end) distance pairs, one per section.
+               Both ends are inclusive.
+        min_distance: Minimum distance to consider for slipstream (meters)
+        min_speed: Minimum speed to consider for slipstream (km/h)
+
+    Returns:
+        Tuple of per-section arrays:
+        - Boolean array indicating if slipstream was detected
+        - Minimum distance to car ahead (NaN if the section has no data)
+        - Maximum speed in the section (NaN if the section has no data)
+    """
+    n_sections = edges.shape[0] // 2
+    min_dist = np.empty(n_sections)
+    max_speed = np.empty(n_sections)
+    has_slipstream = np.zeros(n_sections, dtype=np.bool_)
+
+    for k in range(n_sections):
+        start = np.searchsorted(distance, edges[2 * k], side='left')
+        stop = np.searchsorted(distance, edges[2 * k + 1], side='right')
+
+        section_min = np.inf
+        section_max = -np.inf
+        for i in range(start, stop):
+            # NaN compares false, so missing samples never update the extremes
+            if dist_ahead[i] < section_min:
+                section_min = dist_ahead[i]
+            if speed[i] > section_max:
+                section_max = speed[i]
+
+        min_dist[k] = section_min if section_min != np.inf else np.nan
+        max_speed[k] = section_max if section_max != -np.inf else np.nan
+        has_slipstream[k] = (min_dist[k] < min_distance) and (max_speed[k] > min_speed)
+
+    return has_slipstream, min_dist, max_speed
+
+@njit(cache=True)
+def slipstream_detect(
+    dist_ahead: np.ndarray,
+    speed: np.ndarray,
+    min_distance: float = 50.0,
+    min_speed: float = 300.0
+) -> bool:
+    """Check for slipstream conditions, stopping at the first proof.
+
+    Equivalent to ``min(dist_ahead) < min_distance and max(speed) > min_speed``
+    but returns as soon as both conditions have been seen instead of reading
+    the whole section.
+
+    Args:
+        dist_ahead: Distance to the car ahead (meters)
+        speed: Speed (km/h)
+        min_distance: Minimum distance to consider for slipstream (meters)
+        min_speed: Minimum speed to consider for slipstream (km/h)
+
+    Returns:
+        True if slipstream was detected
+    """
+    close = False
+    fast = False
+    for i in range(dist_ahead.shape[0]):
+        if dist_ahead[i] < min_distance:
+            close = True
+        if speed[i] > min_speed:
+            fast = True
+        if close and fast:
+            return True
+    return False
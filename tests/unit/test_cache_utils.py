@@ -0,0 +1,106 @@
+"""Unit tests for cache utilities."""
+
+import gc
+import os
+import weakref
+import pytest
+import pandas as pd
+from f1_insights.utils.cache_utils import CACHE_DIR, IdentityCache, load_or_build, session_cache_path
+
+@pytest.mark.unit
+def test_load_or_build_builds_and_writes_cache(tmp_path):
+    """Test that the value is built and pickled when no cache exists."""
+    cache_path = tmp_path / 'nested' / 'session.pkl'
+    value = load_or_build(str(cache_path), lambda: {'VER': [1.0, 2.0]})
+    assert value == {'VER': [1.0, 2.0]}
+    assert cache_path.exists()
+
+@pytest.mark.unit
+def test_load_or_build_reuses_cache(tmp_path):
+    """Test that a cached value is returned without calling build_fn."""
+    cache_path = str(tmp_path / 'session.pkl')
+    load_or_build(cache_path, lambda: 'first', key='2025/Australia')
+
+    def fail():
+        raise AssertionError("build_fn should not be called")
+
+    assert load_or_build(cache_path, fail, key='2025/Australia') == 'first'
+
+@pytest.mark.unit
+def test_load_or_build_rebuilds_on_key_change(tmp_path):
+    """Test that a cache written with a different key is rebuilt."""
+    cache_path = str(tmp_path / 'session.pkl')
+    load_or_build(cache_path, lambda: 'old', key='v1')
+    assert load_or_build(cache_path, lambda: 'new', key='v2') == 'new'
+    assert load_or_build(cache_path, lambda: 'unused', key='v2') == 'new'
+
+@pytest.mark.unit
+def test_load_or_build_rebuilds_corrupt_cache(tmp_path):
+    """Test that an unreadable cache file is rebuilt."""
+    cache_path = tmp_path / 'session.pkl'
+    cache_path.write_bytes(b'not a pickle')
+    assert load_or_build(str(cache_path), lambda: 42) == 42
+
+@pytest.mark.unit
+def test_load_or_build_unpicklable_value_leaves_no_cache(tmp_path):
+    """Test that a value that cannot be pickled does not leave a partial cache."""
+    cache_path = tmp_path / 'session.pkl'
+    with pytest.raises(Exception):
+        load_or_build(str(cache_path), lambda: lambda: None)
+    assert list(tmp_path.iterdir()) == []
+
+@pytest.mark.unit
+def test_identity_cache_reuses_value_per_object():
+    """Test that a value is built once per object and rebuilt for a new object."""
+    cache = IdentityCache()
+    builds = []
+
+    def build(df):
+        builds.append(df)
+        return len(df)
+
+    first = pd.DataFrame({'Abbreviation': ['HAM', 'VER']})
+    assert cache.get_or_build(first, build) == 2
+    assert cache.get_or_build(first, build) == 2
+    second = pd.DataFrame({'Abbreviation': ['NOR']})
+    assert cache.get_or_build(second, build) == 1
+    assert len(builds) == 2
+
+@pytest.mark.unit
+def test_identity_cache_does_not_keep_objects_alive():
+    """Test that cached entries do not stop their object from being collected."""
+    cache = IdentityCache()
+    df = pd.DataFrame({'Abbreviation': ['HAM']})
+    cache.get_or_build(df, len)
+    ref = weakref.ref(df)
+    del df
+    gc.collect()
+    assert ref() is None
+
+@pytest.mark.unit
+def test_identity_cache_evicts_oldest_entry():
+    """Test that the cache holds at most maxsize entries."""
+    cache = IdentityCache(maxsize=2)
+    frames = [pd.DataFrame({'x': [i]}) for i in range(3)]
+    for df in frames:
+        cache.get_or_build(df, lambda df: df['x'].iloc[0])
+    builds = []
+    cache.get_or_build(frames[0], lambda df: builds.append(df) or 0)
+    cache.get_or_build(frames[2], lambda df: builds.append(df) or 2)
+    assert len(builds) == 1
+
+@pytest.mark.unit
+def test_session_cache_path():
+    """Test that session pickles share one cache directory and are named per session."""
+    class MockSession:
+        event = pd.Series({'EventName': 'Australian Grand Prix', 'year': 2025})
+        name = 'Qualifying'
+
+    session = MockSession()
+
+    path = session_cache_path(session, '_positions')
+    assert path == os.path.join(
+        CACHE_DIR, 'session_cache', '2025_Australian_Grand_Prix_Qualifying_positions.pkl'
+    )
+    assert os.path.isabs(path)
+    assert session_cache_path(session) != path
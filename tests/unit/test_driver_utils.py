@@ -25,4 +25,13 @@ def test_get_driver_info_all_fields_present(mock_session):
     info = get_driver_info(mock_session, 'VER')
     expected_fields = {'name', 'number', 'team'}
     assert set(info.keys()) == expected_fields
-    assert all(isinstance(value, str) for value in info.values()) 
\ No newline at end of file
+    assert all(isinstance(value, str) for value in info.values()) 
+
+@pytest.mark.unit
+def test_get_driver_info_tracks_replaced_results(mock_session):
+    """Test that lookups follow the session when its results table is replaced."""
+    assert get_driver_info(mock_session, 'NOR')['team'] == 'McLaren'
+    results = mock_session.results.copy()
+    results.loc[results['Abbreviation'] == 'NOR', 'TeamName'] = 'Williams'
+    mock_session.results = results
+    assert get_driver_info(mock_session, 'NOR')['team'] == 'Williams'
@@ -1,24 +1,45 @@
 """Unit tests for telemetry utilities."""
 
+from concurrent.futures import ThreadPoolExecutor
+import gc
+import weakref
 import pytest
 import pandas as pd
 import numpy as np
+from f1_insights.utils import telemetry_utils
 from f1_insights.utils.telemetry_utils import (
+    TelemetryArrays,
+    TelemetryChannels,
+    to_telemetry_channels,
+    get_corner_distance_map,
     get_straight_section_telemetry,
+    get_straight_section_arrays,
     analyze_slipstream,
-    get_driver_lap_telemetry
+    analyze_slipstream_batch,
+    get_driver_lap_telemetry,
+    get_fastest_laps_telemetry
 )
 
+# Mock telemetry channels, generated once with fixed seeds and made read-only
+# so they can be shared safely by every fixture and test
+_MOCK_DISTANCE = np.linspace(0, 1000, 100)
+_MOCK_SPEED = np.random.default_rng(42).uniform(200, 350, 100)
+_MOCK_DIST_AHEAD = np.random.default_rng(43).uniform(30, 100, 100)
+for _array in (_MOCK_DISTANCE, _MOCK_SPEED, _MOCK_DIST_AHEAD):
+    _array.flags.writeable = False
+
+def _mock_telemetry_frame():
+    """Build a telemetry DataFrame from the shared mock channels."""
+    return pd.DataFrame({
+        'Distance': _MOCK_DISTANCE,
+        'Speed': _MOCK_SPEED,
+        'DistanceToCarAhead': _MOCK_DIST_AHEAD
+    })
+
 @pytest.fixture
 def mock_telemetry():
     """Create mock telemetry data."""
-    # Use fixed seed for reproducibility
-    np.random.seed(42)
-    return pd.DataFrame({
-        'Distance': np.linspace(0, 1000, 100),
-        'Speed': np.random.uniform(200, 350, 100),
-        'DistanceToCarAhead': np.random.uniform(30, 100, 100)
-    })
+    return _mock_telemetry_frame()
 
 @pytest.fixture
 def mock_circuit():
@@ -30,33 +51,18 @@ def mock_circuit():
 
 @pytest.fixture
 def mock_session():
-    """Create a mock FastF1 session."""
-    class MockLap:
-        def __init__(self, driver):
-            self.driver = driver
-        
-        def get_telemetry(self):
-            return pd.DataFrame({
-                'Distance': np.linspace(0, 1000, 100),
-                'Speed': np.random.uniform(200, 350, 100),
-                'DistanceToCarAhead': np.random.uniform(30, 100, 100)
-            })
-    
-    class MockLaps:
-        def __init__(self):
-            self.laps = pd.DataFrame({
-                'LapNumber': [1, 2],
-                'LapTime': [80.0, 79.5]
-            })
-        
-        def pick_driver(self, driver):
-            return self
+    """Create a mock FastF1 session whose laps are a DataFrame subclass."""
+    class MockLaps(pd.DataFrame):
+        @property
+        def _constructor(self):
+            return MockLaps
         
         def pick_fastest(self):
-            return MockLap('VER')
+            return self.sort_values('LapTime').iloc[[0]]
         
-        def pick_lap(self, lap_number):
-            return MockLap('HAM')
+        def get_telemetry(self):
+            # Tag the shared mock channels with the lap they were requested for
+            return _mock_telemetry_frame().assign(LapNumber=self['LapNumber'].iloc[0])
     
     class MockCircuitInfo:
         def __init__(self):
@@ -67,7 +73,11 @@ def mock_session():
     
     class MockSession:
         def __init__(self):
-            self.laps = MockLaps()
+            self.laps = MockLaps({
+                'Driver': ['VER', 'VER', 'HAM', 'HAM'],
+                'LapNumber': [1, 2, 1, 2],
+                'LapTime': [80.0, 79.5, 80.2, 80.4]
+            })
         
         def get_circuit_info(self):
             return MockCircuitInfo()
@@ -77,11 +87,7 @@ def mock_session():
 @pytest.mark.unit
 def test_get_straight_section_telemetry(mock_session):
     """Test extracting telemetry for a specific section."""
-    telemetry = pd.DataFrame({
-        'Distance': np.linspace(0, 1000, 100),
-        'Speed': np.random.uniform(200, 350, 100),
-        'DistanceToCarAhead': np.random.uniform(30, 100, 100)
-    })
+    telemetry = _mock_telemetry_frame()
     
     section = get_straight_section_telemetry(
         telemetry,
@@ -94,6 +100,100 @@ def test_get_straight_section_telemetry(mock_session):
     assert section['Distance'].min() >= 500
     assert section['Distance'].max() <= 700
 
+@pytest.mark.unit
+def test_get_straight_section_telemetry_includes_corner_samples(mock_session):
+    """Test that samples exactly at the corner distances are kept."""
+    telemetry = pd.DataFrame({
+        'Distance': np.arange(0.0, 1001.0, 100.0),
+        'Speed': np.full(11, 300.0)
+    })
+
+    section = get_straight_section_telemetry(
+        telemetry, 'Turn 13', 'Turn 14', mock_session.get_circuit_info()
+    )
+
+    assert section['Distance'].tolist() == [500.0, 600.0, 700.0]
+
+@pytest.mark.unit
+def test_get_corner_distance_map(mock_session):
+    """Test building the corner to distance lookup."""
+    distance_map = get_corner_distance_map(mock_session.get_circuit_info())
+    assert distance_map == {'Turn 13': 500, 'Turn 14': 700}
+
+@pytest.mark.unit
+def test_get_straight_section_telemetry_with_distance_map(mock_telemetry):
+    """Test extracting a section using a prebuilt corner distance map."""
+    section = get_straight_section_telemetry(
+        mock_telemetry, 'Turn 13', 'Turn 14', {'Turn 13': 500, 'Turn 14': 700}
+    )
+    assert section['Distance'].min() >= 500
+    assert section['Distance'].max() <= 700
+
+    missing = get_straight_section_telemetry(
+        mock_telemetry, 'Turn 1', 'Turn 14', {'Turn 13': 500, 'Turn 14': 700}
+    )
+    assert missing.empty
+
+@pytest.mark.unit
+def test_get_straight_section_arrays(mock_telemetry):
+    """Test returning a section as row bounds and zero-copy column views."""
+    start, stop, arrays = get_straight_section_arrays(
+        mock_telemetry, 'Turn 13', 'Turn 14', {'Turn 13': 500, 'Turn 14': 700},
+        ['DistanceToCarAhead', 'Speed']
+    )
+
+    speed = mock_telemetry['Speed'].to_numpy()
+    assert set(arrays) == {'DistanceToCarAhead', 'Speed'}
+    assert np.array_equal(arrays['Speed'], speed[start:stop])
+    assert np.shares_memory(arrays['Speed'], speed)
+    assert analyze_slipstream(arrays) == analyze_slipstream(mock_telemetry.iloc[start:stop])
+
+    with pytest.raises(TypeError):
+        get_straight_section_arrays(
+            to_telemetry_channels(mock_telemetry), 'Turn 13', 'Turn 14',
+            {'Turn 13': 500, 'Turn 14': 700}, ['Speed']
+        )
+
+@pytest.mark.unit
+def test_get_straight_section_arrays_unknown_corner_keeps_dtypes():
+    """Test that an unknown corner yields empty slices of the real columns."""
+    telemetry = pd.DataFrame({
+        'Distance': np.linspace(0, 1000, 10, dtype=np.float32),
+        'Speed': np.full(10, 300, dtype=np.float32),
+        'DistanceToCarAhead': np.full(10, 40, dtype=np.float32)
+    })
+
+    start, stop, arrays = get_straight_section_arrays(
+        telemetry, 'Turn 1', 'Turn 14', {'Turn 14': 700}, ['Speed']
+    )
+    assert (start, stop) == (0, 0)
+    assert arrays['Speed'].size == 0 and arrays['Speed'].dtype == np.float32
+
+    section = get_straight_section_telemetry(
+        to_telemetry_channels(telemetry), 'Turn 1', 'Turn 14', {'Turn 14': 700}
+    )
+    assert isinstance(section, TelemetryChannels)
+    assert all(channel.size == 0 and channel.dtype == np.float32 for channel in section)
+    has_slipstream, min_dist, max_speed = analyze_slipstream(section)
+    assert not has_slipstream and np.isnan(min_dist) and np.isnan(max_speed)
+
+@pytest.mark.unit
+def test_telemetry_channels_section(mock_telemetry):
+    """Test slicing and analyzing a section held as TelemetryChannels."""
+    channels = to_telemetry_channels(mock_telemetry)
+    assert np.shares_memory(channels.speed, mock_telemetry['Speed'].to_numpy())
+
+    section = get_straight_section_telemetry(
+        channels, 'Turn 13', 'Turn 14', {'Turn 13': 500, 'Turn 14': 700}
+    )
+    expected = get_straight_section_telemetry(
+        mock_telemetry, 'Turn 13', 'Turn 14', {'Turn 13': 500, 'Turn 14': 700}
+    )
+
+    assert isinstance(section, TelemetryChannels)
+    assert np.array_equal(section.distance, expected['Distance'].to_numpy())
+    assert analyze_slipstream(section) == analyze_slipstream(expected)
+
 @pytest.mark.unit
 def test_analyze_slipstream_with_slipstream(mock_telemetry):
     """Test slipstream detection when conditions are met."""
@@ -126,6 +226,95 @@ def test_analyze_slipstream_without_slipstream(mock_telemetry):
     assert min_dist == 60.0
     assert max_speed == 290.0
 
+@pytest.mark.unit
+def test_analyze_slipstream_ignores_missing_gap():
+    """Test that samples without a car ahead (NaN gap) are skipped."""
+    test_telemetry = pd.DataFrame({
+        'Distance': np.linspace(0, 1000, 4),
+        'Speed': [290.0, np.nan, 310.0, 305.0],
+        'DistanceToCarAhead': [np.nan, 40.0, np.nan, 45.0]
+    })
+
+    has_slipstream, min_dist, max_speed = analyze_slipstream(test_telemetry)
+
+    assert has_slipstream
+    assert min_dist == 40.0
+    assert max_speed == 310.0
+
+@pytest.mark.unit
+def test_analyze_slipstream_empty_section():
+    """Test that an empty section reports no slipstream instead of raising."""
+    empty_frame = pd.DataFrame({'Distance': [], 'Speed': [], 'DistanceToCarAhead': []})
+    empty_inputs = [
+        empty_frame,
+        {'DistanceToCarAhead': np.empty(0), 'Speed': np.empty(0)},
+        to_telemetry_channels(empty_frame)
+    ]
+
+    for telemetry in empty_inputs:
+        for detect_only in (False, True):
+            has_slipstream, min_dist, max_speed = analyze_slipstream(
+                telemetry, detect_only=detect_only
+            )
+            assert not has_slipstream
+            assert np.isnan(min_dist) and np.isnan(max_speed)
+
+@pytest.mark.unit
+def test_analyze_slipstream_detect_only():
+    """Test that detect_only reports detection without the section extremes."""
+    test_telemetry = pd.DataFrame({
+        'Distance': np.linspace(0, 1000, 4),
+        'Speed': [290.0, 310.0, 305.0, 295.0],
+        'DistanceToCarAhead': [60.0, 55.0, 40.0, 70.0]
+    })
+
+    has_slipstream, min_dist, max_speed = analyze_slipstream(test_telemetry, detect_only=True)
+    assert has_slipstream
+    assert np.isnan(min_dist) and np.isnan(max_speed)
+
+    has_slipstream, _, _ = analyze_slipstream(test_telemetry, min_distance=30.0, detect_only=True)
+    assert not has_slipstream
+
+@pytest.mark.unit
+@pytest.mark.parametrize('use_numba', [False, True])
+def test_analyze_slipstream_batch(monkeypatch, use_numba):
+    """Test batch analysis matches per-section analysis, with and without numba."""
+    if use_numba:
+        pytest.importorskip('numba')
+    else:
+        monkeypatch.setattr(telemetry_utils, 'slipstream_scan', None)
+
+    telemetry = _mock_telemetry_frame()
+    # Overlapping, empty and lap-end sections are all supported
+    sections = [(100, 300), (250, 400), (1200, 1300), (900, 1000)]
+    edges = np.array(sections, dtype=float).ravel()
+
+    has_slipstream, min_dist, max_speed = analyze_slipstream_batch(
+        _MOCK_DISTANCE, _MOCK_DIST_AHEAD, _MOCK_SPEED, edges, min_speed=340.0
+    )
+
+    for k, (start, end) in enumerate(sections):
+        section = get_straight_section_telemetry(telemetry, 'start', 'end', {'start': start, 'end': end})
+        if section.empty:
+            assert np.isnan(min_dist[k]) and np.isnan(max_speed[k]) and not has_slipstream[k]
+        else:
+            assert (has_slipstream[k], min_dist[k], max_speed[k]) == \
+                analyze_slipstream(section, min_speed=340.0)
+
+@pytest.mark.unit
+@pytest.mark.parametrize('use_numba', [False, True])
+def test_analyze_slipstream_batch_rejects_unpaired_edges(monkeypatch, use_numba):
+    """Test that edges without a matching end raise instead of being dropped."""
+    if use_numba:
+        pytest.importorskip('numba')
+    else:
+        monkeypatch.setattr(telemetry_utils, 'slipstream_scan', None)
+
+    with pytest.raises(ValueError):
+        analyze_slipstream_batch(
+            _MOCK_DISTANCE, _MOCK_DIST_AHEAD, _MOCK_SPEED, [100.0, 300.0, 900.0]
+        )
+
 @pytest.mark.unit
 def test_get_driver_lap_telemetry(mock_session):
     """Test getting telemetry data for a driver's lap."""
@@ -140,6 +329,66 @@ def test_get_driver_lap_telemetry(mock_session):
     assert isinstance(telemetry, pd.DataFrame)
     assert len(telemetry) > 0
 
+@pytest.mark.unit
+def test_get_driver_lap_telemetry_by_driver(mock_session):
+    """Test that each driver's fastest or requested lap is used."""
+    telemetry = get_driver_lap_telemetry(mock_session, 'VER')
+    assert (telemetry['LapNumber'] == 2).all()
+    assert telemetry['Distance'].dtype == np.float32
+
+    telemetry = get_driver_lap_telemetry(mock_session, 'HAM')
+    assert (telemetry['LapNumber'] == 1).all()
+
+    telemetry = get_driver_lap_telemetry(mock_session, 'HAM', lap_number=2)
+    assert (telemetry['LapNumber'] == 2).all()
+
+@pytest.mark.unit
+def test_get_driver_lap_telemetry_unknown_driver(mock_session):
+    """Test that a driver without laps yields an empty DataFrame."""
+    assert get_driver_lap_telemetry(mock_session, 'XXX').empty
+
+@pytest.mark.unit
+def test_empty_results_are_independent(mock_session):
+    """Test that modifying one empty result does not affect later ones."""
+    empty = get_driver_lap_telemetry(mock_session, 'XXX')
+    empty['Time'] = []
+
+    section = get_straight_section_telemetry(
+        _mock_telemetry_frame(), 'Turn 1', 'Turn 14', {'Turn 14': 700}
+    )
+    assert section.empty
+    assert 'Time' not in section.columns
+
+@pytest.mark.unit
+def test_get_driver_lap_telemetry_does_not_keep_laps_alive(mock_session):
+    """Test that the per-driver lap cache does not pin the laps table in memory."""
+    get_driver_lap_telemetry(mock_session, 'VER')
+    laps_ref = weakref.ref(mock_session.laps)
+    mock_session.laps = None
+    gc.collect()
+    assert laps_ref() is None
+
+@pytest.mark.unit
+def test_get_driver_lap_telemetry_threads_share_grouping(mock_session, monkeypatch):
+    """Test that concurrent lookups build the per-driver grouping only once."""
+    laps_type = type(mock_session.laps)
+    builds = []
+
+    def counting_groupby(self, *args, **kwargs):
+        builds.append(args)
+        return pd.DataFrame.groupby(self, *args, **kwargs)
+
+    monkeypatch.setattr(laps_type, 'groupby', counting_groupby, raising=False)
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(
+            lambda driver: get_driver_lap_telemetry(mock_session, driver),
+            ['VER', 'HAM'] * 3
+        ))
+
+    assert len(builds) == 1
+    assert all(not telemetry.empty for telemetry in results)
+
 @pytest.mark.unit
 def test_circuit_info_structure(mock_session):
     """Test to understand CircuitInfo structure."""
@@ -147,4 +396,89 @@ def test_circuit_info_structure(mock_session):
     assert hasattr(circuit, 'corners')
     assert isinstance(circuit.corners, pd.DataFrame)
     assert 'Number' in circuit.corners.columns
-    assert 'Distance' in circuit.corners.columns 
\ No newline at end of file
+    assert 'Distance' in circuit.corners.columns
+
+@pytest.fixture
+def mock_fastest_laps_session():
+    """Create a mock FastF1 session supporting pick_drivers().pick_fastest()."""
+    class MockTelemetry(pd.DataFrame):
+        def add_distance(self):
+            telemetry = self.copy()
+            telemetry['Distance'] = np.linspace(0, 1000, len(telemetry))
+            return telemetry
+
+    class MockLap(dict):
+        empty = False
+
+        def get_car_data(self):
+            return MockTelemetry({
+                'Speed': np.linspace(100, 300, 50),
+                'Time': pd.to_timedelta(np.linspace(0, 80, 50), unit='s')
+            })
+
+        def get_telemetry(self):
+            telemetry = self.get_car_data().add_distance()
+            telemetry['X'] = np.arange(50.0)
+            telemetry['Y'] = -np.arange(50.0)
+            return telemetry
+
+    class MockDriverLaps:
+        def __init__(self, lap):
+            self.lap = lap
+
+        def pick_fastest(self):
+            return self.lap
+
+    class MockLaps:
+        def pick_drivers(self, driver):
+            if driver == 'XXX':
+                return MockDriverLaps(None)
+            if driver == 'ERR':
+                raise ValueError("corrupt lap data")
+            return MockDriverLaps(MockLap(Team='Ferrari', LapTime=pd.Timedelta(seconds=80.5)))
+
+    class MockSession:
+        def __init__(self):
+            self.laps = MockLaps()
+            self.results = pd.DataFrame({'Abbreviation': ['HAM', 'LEC']})
+
+    return MockSession()
+
+@pytest.mark.unit
+def test_get_fastest_laps_telemetry(mock_fastest_laps_session):
+    """Test extracting fastest-lap telemetry arrays for all session drivers."""
+    telemetry = get_fastest_laps_telemetry(mock_fastest_laps_session)
+
+    assert list(telemetry) == ['HAM', 'LEC']
+    arrays = telemetry['HAM']
+    assert isinstance(arrays, TelemetryArrays)
+    assert isinstance(arrays.distance, np.ndarray)
+    assert arrays.distance.dtype == np.float32
+    assert arrays.speed.dtype == np.float32
+    assert arrays.time_s.dtype == np.float32
+    assert len(arrays.distance) == len(arrays.speed) == len(arrays.time_s) == 50
+    assert arrays.time_s[-1] == pytest.approx(80.0)
+    assert arrays.x is None and arrays.y is None
+    assert arrays.team == 'Ferrari'
+    assert arrays.lap_time_s == pytest.approx(80.5)
+
+@pytest.mark.unit
+def test_get_fastest_laps_telemetry_with_position(mock_fastest_laps_session):
+    """Test that position channels are included when requested."""
+    telemetry = get_fastest_laps_telemetry(
+        mock_fastest_laps_session, ['LEC'], with_position=True
+    )
+
+    assert telemetry['LEC'].x.dtype == np.float32
+    assert np.array_equal(telemetry['LEC'].x, np.arange(50.0))
+    assert np.array_equal(telemetry['LEC'].y, -np.arange(50.0))
+
+@pytest.mark.unit
+def test_get_fastest_laps_telemetry_skips_failing_drivers(mock_fastest_laps_session):
+    """Test that drivers without a lap or with errors are left out."""
+    telemetry = get_fastest_laps_telemetry(
+        mock_fastest_laps_session, ['XXX', 'HAM', 'ERR']
+    )
+
+    assert list(telemetry) == ['HAM']
+
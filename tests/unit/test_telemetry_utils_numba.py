@@ -0,0 +1,44 @@
+"""Unit tests for the numba telemetry kernels."""
+
+import pytest
+import numpy as np
+
+pytest.importorskip('numba')
+from f1_insights.utils.telemetry_utils_numba import slipstream_detect, slipstream_scan
+
+@pytest.mark.unit
+def test_slipstream_scan_matches_per_section_reduction():
+    """Test that each section's min gap and max speed are found, ends inclusive."""
+    distance = np.arange(0.0, 1001.0, 100.0)
+    dist_ahead = np.array([90, 80, 70, 40, 60, 55, 65, 75, 20, 85, 95], dtype=float)
+    speed = np.array([250, 260, 310, 305, 320, 315, 280, 290, 295, 299, 330], dtype=float)
+    edges = np.array([200.0, 400.0, 700.0, 900.0])
+
+    has_slipstream, min_dist, max_speed = slipstream_scan(distance, dist_ahead, speed, edges)
+
+    assert min_dist.tolist() == [40.0, 20.0]
+    assert max_speed.tolist() == [320.0, 299.0]
+    assert has_slipstream.tolist() == [True, False]
+
+@pytest.mark.unit
+def test_slipstream_scan_skips_nan_and_empty_sections():
+    """Test that NaN samples are ignored and sections without data yield NaN."""
+    distance = np.array([0.0, 100.0, 200.0, 300.0])
+    dist_ahead = np.array([np.nan, 30.0, np.nan, 45.0])
+    speed = np.array([305.0, np.nan, 310.0, 290.0])
+    edges = np.array([0.0, 300.0, 500.0, 600.0])
+
+    has_slipstream, min_dist, max_speed = slipstream_scan(distance, dist_ahead, speed, edges)
+
+    assert min_dist[0] == 30.0 and max_speed[0] == 310.0 and has_slipstream[0]
+    assert np.isnan(min_dist[1]) and np.isnan(max_speed[1]) and not has_slipstream[1]
+
+@pytest.mark.unit
+def test_slipstream_detect():
+    """Test that detection requires both a close gap and a high speed."""
+    dist_ahead = np.array([np.nan, 80.0, 40.0, 60.0])
+    speed = np.array([250.0, 310.0, np.nan, 290.0])
+
+    assert slipstream_detect(dist_ahead, speed, 50.0, 300.0)
+    assert not slipstream_detect(dist_ahead, speed, 30.0, 300.0)
+    assert not slipstream_detect(dist_ahead, speed, 50.0, 320.0)